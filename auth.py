@@ -0,0 +1,48 @@
+import hashlib
+import json
+import os
+
+
+class AuthService:
+    def __init__(self):
+        self.users_file = "users.json"
+        self.users = {}
+        self.load_users()
+
+    def login(self, username, password):
+        if username not in self.users:
+            return False, "Неверное имя пользователя"
+
+        if AuthService.verify_password(password, self.users[username]):
+            return True, "Успешный вход"
+
+        return False, "Неверный пароль"
+
+    def register(self, username, password, confirm_password):
+        if username in self.users:
+            return False, "Такое имя пользователя уже зарегистрировано"
+
+        if password != confirm_password:
+            return False, "Пароли не совпадают"
+
+        self.users[username] = AuthService.hash_password(password)
+        self.save_users()
+
+        return True, "Успешная регистрация"
+
+    @staticmethod
+    def hash_password(password):
+        return hashlib.sha256(password.encode()).hexdigest()
+
+    @staticmethod
+    def verify_password(password, hashed_password):
+        return AuthService.hash_password(password) == hashed_password
+
+    def save_users(self):
+        with open(self.users_file, "w") as f:
+            json.dump(self.users, f)
+
+    def load_users(self):
+        if os.path.exists(self.users_file):
+            with open(self.users_file, "r") as f:
+                self.users = json.load(f)
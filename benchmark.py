@@ -0,0 +1,141 @@
+"""Замеры времени запуска (импорт модулей и первый ход компьютера) и сравнение алгоритмов поиска.
+
+Замеры запуска выполняются в отдельных процессах, чтобы кэш импортов не влиял на результат.
+С ключом --match разыгрываются партии MCTS против PVS при равном процессорном времени на ход.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+RUNS = 5
+
+IMPORT_SCRIPTS = {
+    "import engine": "import engine",
+    "import auth": "import auth",
+    "import main": "import main",
+    "import ui": "import ui",
+}
+
+FIRST_MOVE_SCRIPT = """
+import time
+start = time.perf_counter()
+from engine import ModeState, TicTacToe
+game = TicTacToe(mode=ModeState.computer)
+game.make_move(5, 5)
+print(time.perf_counter() - start)
+"""
+
+
+# Позиции для сравнения поиска: последовательности ходов от пустого поля 10x10
+SEARCH_POSITIONS = {
+    "дебют": [(5, 5), (4, 4), (5, 6)],
+    "открытая тройка": [(5, 3), (4, 4), (5, 4), (6, 6), (5, 5)],
+    "разорванная четверка": [(5, 1), (4, 4), (5, 2), (6, 6), (5, 4), (3, 3), (5, 5)],
+    "миттельшпиль": [(5, 5), (4, 4), (4, 5), (6, 5), (3, 5), (2, 5), (4, 6), (4, 3), (3, 4), (5, 4)],
+    "плотная позиция": [(4, 4), (4, 5), (5, 5), (3, 3), (5, 4), (6, 6), (3, 5), (5, 3), (6, 4),
+                        (7, 4), (2, 6), (4, 3), (6, 3), (2, 3)],
+}
+SEARCH_DEPTHS = (2, 3)
+
+
+def measure_process(script):
+    """Время работы интерпретатора с заданным скриптом, включая запуск, в секундах."""
+    best = float("inf")
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", script], check=True, stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_first_move():
+    """Время от начала импорта движка до ответного хода компьютера, в секундах."""
+    best = float("inf")
+    for _ in range(RUNS):
+        result = subprocess.run([sys.executable, "-c", FIRST_MOVE_SCRIPT], check=True,
+                                capture_output=True, text=True)
+        best = min(best, float(result.stdout))
+    return best
+
+
+def compare_search():
+    """Сравнивает minimax и PVS с итеративным углублением по числу узлов и времени."""
+    from engine import ModeState, TicTacToe
+
+    print()
+    print(f"{'Позиция':<24}{'Глубина':>8}{'minimax':>12}{'PVS':>12}{'мс':>16}  Ход")
+    totals = {depth: [0, 0] for depth in SEARCH_DEPTHS}
+    for name, moves in SEARCH_POSITIONS.items():
+        game = TicTacToe(mode=ModeState.player)
+        for move in moves:
+            game.push(move)
+        for depth in SEARCH_DEPTHS:
+            game.nodes = 0
+            start = time.perf_counter()
+            _, minimax_move = game.minimax(depth, maximizing_player=game.current_player == 1)
+            minimax_time = time.perf_counter() - start
+            minimax_nodes = game.nodes
+
+            start = time.perf_counter()
+            pvs_move = game.get_best_move(depth)
+            pvs_time = time.perf_counter() - start
+
+            totals[depth][0] += minimax_nodes
+            totals[depth][1] += game.nodes
+            match = "совпадает" if minimax_move == pvs_move else f"{minimax_move} != {pvs_move}"
+            print(f"{name:<24}{depth:>8}{minimax_nodes:>12}{game.nodes:>12}"
+                  f"{minimax_time * 1000:>8.0f}/{pvs_time * 1000:<7.0f}  {match}")
+    for depth, (minimax_nodes, pvs_nodes) in totals.items():
+        print(f"Глубина {depth}: PVS перебирает {pvs_nodes / minimax_nodes:.0%} узлов minimax")
+
+
+def play_match(games, time_limit, workers):
+    """Партии MCTS против PVS. MCTS получает time_limit секунд в workers процессах,
+    PVS - time_limit * workers секунд в одном процессе, то есть столько же процессорного времени."""
+    import mcts
+    from engine import ModeState, TicTacToe
+
+    results = {"победы MCTS": 0, "ничьи": 0, "победы PVS": 0}
+    for index in range(games):
+        mcts_player = 1 if index % 2 == 0 else -1
+        game = TicTacToe(mode=ModeState.player)
+        while not game.game_over:
+            if game.current_player == mcts_player:
+                move = mcts.get_best_move(game, time_limit, workers)
+            else:
+                move = game.get_best_move(depth=None, time_limit=time_limit * workers)
+            game.push(move)
+        winner = "ничья" if not game.winner else "MCTS" if game.winner == mcts_player else "PVS"
+        results["ничьи" if not game.winner else f"победы {winner}"] += 1
+        print(f"Партия {index + 1}: MCTS играет {'X' if mcts_player == 1 else 'O'}, "
+              f"результат: {winner}, ходов: {game.moves}")
+    print(", ".join(f"{name}: {count}" for name, count in results.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--match", type=int, metavar="GAMES", help="сыграть партии MCTS против PVS")
+    parser.add_argument("--time", type=float, default=1.0, help="время на ход в секундах для одного процесса")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="число процессов MCTS")
+    args = parser.parse_args()
+    if args.match:
+        play_match(args.match, args.time, args.workers)
+        return
+
+    baseline = measure_process("pass")
+    print(f"{'Запуск интерпретатора':<24}{baseline * 1000:8.1f} мс")
+    for name, script in IMPORT_SCRIPTS.items():
+        try:
+            elapsed = measure_process(script) - baseline
+        except subprocess.CalledProcessError:
+            print(f"{name:<24}{'ошибка':>8}")
+            continue
+        print(f"{name:<24}{elapsed * 1000:8.1f} мс")
+    print(f"{'Первый ход компьютера':<24}{measure_first_move() * 1000:8.1f} мс")
+    compare_search()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,632 @@
+import time
+from array import array
+from enum import Enum
+
+
+class ModeState(Enum):
+    computer = "Против компьютера"
+    mcts = "Против компьютера (MCTS)"
+    player = "Против игрока"
+
+
+def _splitmix64(seed):
+    """Генератор псевдослучайных 64-битных чисел для ключей Зобриста (без импорта random)."""
+    mask = (1 << 64) - 1
+    while True:
+        seed = (seed + 0x9E3779B97F4A7C15) & mask
+        z = seed
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & mask
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & mask
+        yield z ^ (z >> 31)
+
+
+# Оценки фигур в окне: (для игрока, чей ход, для его соперника)
+_SHAPE_SCORES = {
+    "five": (200000000, 200000000),
+    "four": (100000000, 50000),  # XXXX_, XX_XX, X_XXX - один ход до пяти
+    "open_three": (10000, 500),  # _XXX_
+    "split_three": (5000, 200),  # _X_XX, XX_X_
+    "three": (50, 7),  # XXX__, X_X_X
+    "close_two": (5, 5),  # _XX__, X_X__
+    "two": (2, 2),  # X__X_, X___X
+    "one": (1, 0.5),
+}
+
+
+def _classify_shape(stones):
+    """Определяет фигуру по фишкам одного игрока в окне (кортеж из 0 и 1)."""
+    count = sum(stones)
+    first = stones.index(1)
+    span = len(stones) - stones[::-1].index(1) - first
+    if count == len(stones):
+        return "five"
+    if count == len(stones) - 1:
+        return "four"
+    if count == 3:
+        if span == 3 and first > 0 and stones[-1] == 0:
+            return "open_three"
+        return "split_three" if span == 4 else "three"
+    if count == 2:
+        return "close_two" if span <= 3 else "two"
+    return "one"
+
+
+def _pattern_tables(length):
+    """Оценки и число фигур для всех троичных кодов окна из length клеток.
+
+    От размера поля не зависят, поэтому строятся один раз и общие для всех _BoardTables.
+    """
+    score_x = array("d", bytes(8 * 3 ** length))
+    score_o = array("d", score_x)
+    x_count = array("B")
+    o_count = array("B")
+    for code in range(3 ** length):
+        digits = [code // 3 ** i % 3 for i in range(length)]
+        x_count.append(digits.count(1))
+        o_count.append(digits.count(2))
+        if 1 in digits and 2 in digits or not any(digits):
+            continue
+        player = 1 if 1 in digits else 2
+        to_move, waiting = _SHAPE_SCORES[_classify_shape(tuple(int(d == player) for d in digits))]
+        if player == 1:
+            score_x[code], score_o[code] = to_move, waiting
+        else:
+            score_x[code], score_o[code] = -waiting, -to_move
+    return score_x, score_o, x_count, o_count
+
+
+class _SearchTimeout(Exception):
+    """Время на поиск хода истекло."""
+
+
+class _BoardTables:
+    """Неизменяемые таблицы, общие для всех игр одного размера поля.
+
+    Окна - все отрезки из winning_length клеток по четырем направлениям. Клетки окон хранятся
+    подряд в плоском массиве windows, а окна каждой клетки - в cell_windows с границами
+    cell_windows_start[cell]:cell_windows_start[cell + 1]; cell_window_powers хранит вес
+    клетки в троичном коде окна (3 ** позиция клетки в окне).
+
+    Код окна - число в троичной записи, где пустая клетка - 0, крестик - 1, нолик - 2.
+    pattern_score_x[code] и pattern_score_o[code] - оценка окна при ходе крестиков и ноликов,
+    pattern_x_count[code] и pattern_o_count[code] - число крестиков и ноликов в окне.
+    """
+    __slots__ = ("size", "zobrist", "side_key", "windows", "cell_windows", "cell_windows_start",
+                 "cell_window_powers", "pattern_score_x", "pattern_score_o", "pattern_x_count",
+                 "pattern_o_count", "neighbours")
+
+    _cache = {}
+
+    def __init__(self, size):
+        cells = size * size
+        length = TicTacToe.winning_length
+        keys = _splitmix64(size)
+        self.size = size
+        # Ключи Зобриста: по одному на каждую пару (клетка, игрок)
+        self.zobrist = array("Q", (next(keys) for _ in range(cells * 2)))
+        self.side_key = next(keys)
+
+        # Номера клеток и окон превышают 65535 уже на поле 61x61, поэтому индексы 32-битные
+        self.windows = array("I")
+        per_cell = [[] for _ in range(cells)]
+        for dr, dc in TicTacToe.directions:
+            for row in range(size):
+                for col in range(size):
+                    end_row, end_col = row + dr * (length - 1), col + dc * (length - 1)
+                    if not (0 <= end_row < size and 0 <= end_col < size):
+                        continue
+                    window = len(self.windows) // length
+                    for i in range(length):
+                        cell = (row + dr * i) * size + col + dc * i
+                        self.windows.append(cell)
+                        per_cell[cell].append((window, 3 ** i))
+        self.cell_windows = array("I")
+        self.cell_window_powers = array("H")
+        self.cell_windows_start = array("I", [0])
+        for windows in per_cell:
+            for window, power in windows:
+                self.cell_windows.append(window)
+                self.cell_window_powers.append(power)
+            self.cell_windows_start.append(len(self.cell_windows))
+
+        (self.pattern_score_x, self.pattern_score_o,
+         self.pattern_x_count, self.pattern_o_count) = _PATTERN_TABLES
+
+        # Соседи в радиусе 2 с весами для приоритизации ходов
+        self.neighbours = []
+        for row in range(size):
+            for col in range(size):
+                cell_neighbours = []
+                for dr in range(-2, 3):
+                    for dc in range(-2, 3):
+                        r, c = row + dr, col + dc
+                        if (dr or dc) and 0 <= r < size and 0 <= c < size:
+                            cell_neighbours.append((r * size + c, 3 if abs(dr) <= 1 and abs(dc) <= 1 else 1))
+                self.neighbours.append(tuple(cell_neighbours))
+
+    @classmethod
+    def for_size(cls, size):
+        """Возвращает таблицы для поля заданного размера, создавая их один раз."""
+        tables = cls._cache.get(size)
+        if tables is None:
+            tables = cls._cache[size] = cls(size)
+        return tables
+
+
+def _board_index(index, size, what):
+    """Индекс строки или столбца поля с поддержкой отрицательных значений, как у списка."""
+    if index < 0:
+        index += size
+    if not 0 <= index < size:
+        raise IndexError(f"board {what} out of range")
+    return index
+
+
+class _BoardRow:
+    """Строка поля: запись в клетку обновляет производное состояние игры так же, как push/pop."""
+    __slots__ = ("_game", "_offset")
+
+    def __init__(self, game, row):
+        self._game = game
+        self._offset = row * game.size
+
+    def __len__(self):
+        return self._game.size
+
+    def __getitem__(self, col):
+        return self._game._cells[self._offset + _board_index(col, self._game.size, "column")]
+
+    def __setitem__(self, col, player):
+        self._game._set_cell(self._offset + _board_index(col, self._game.size, "column"), player)
+
+    def __iter__(self):
+        size = self._game.size
+        return iter(self._game._cells[self._offset:self._offset + size])
+
+
+class _BoardRows:
+    """Построчный доступ board[row][col] к плоскому массиву клеток игры."""
+    __slots__ = ("_game",)
+
+    def __init__(self, game):
+        self._game = game
+
+    def __len__(self):
+        return self._game.size
+
+    def __getitem__(self, row):
+        return _BoardRow(self._game, _board_index(row, self._game.size, "row"))
+
+    def __iter__(self):
+        return (_BoardRow(self._game, row) for row in range(self._game.size))
+
+
+class TicTacToe:
+    __slots__ = ("size", "_cells", "_player", "mode", "game_over", "moves",
+                 "hash", "winner", "nodes", "_tables", "_stack", "_priority", "_codes",
+                 "_eval_x", "_eval_o", "_live_x", "_live_o", "_deadline", "_killers", "_hash_moves")
+
+    winning_length = 5
+    directions = ((0, 1), (1, 0), (1, 1), (1, -1))
+    # Полуширина окна стремления вокруг оценки предыдущей итерации
+    aspiration_window = 500
+    # Оценка выигранной партии: больше любой суммы оценок окон; к ней прибавляется оставшаяся
+    # глубина, чтобы более быстрый выигрыш ценился выше
+    win_score = 1e12
+    # Время на ход компьютера в режиме MCTS, в секундах
+    mcts_time_limit = 1.0
+
+    def __init__(self, size=10, mode: ModeState = ModeState.computer):
+        self.size = size
+        # Клетки поля хранятся подряд в одном массиве: клетка (row, col) - индекс row * size + col
+        self._cells = array("b", bytes(size * size))
+        self._player = 1
+        self.mode = mode
+        self.game_over = False
+        self.moves = 0
+        self.nodes = 0
+        self._tables = _BoardTables.for_size(size)
+        # Стек ходов и таблицы поиска создаются только при использовании
+        self._stack = None
+        self._deadline = None
+        self._killers = None
+        self._hash_moves = None
+        self.sync()
+
+    @property
+    def board(self):
+        """Поле в виде строк: board[row][col] читает и изменяет клетку плоского массива.
+
+        Запись в клетку минует стек ходов, но хеш, коды окон, кандидаты, оценка, число ходов
+        и победитель обновляются сразу, как при push/pop.
+        """
+        return _BoardRows(self)
+
+    @property
+    def current_player(self):
+        """Игрок, чей ход: 1 - крестики, -1 - нолики."""
+        return self._player
+
+    @current_player.setter
+    def current_player(self, player):
+        # Очередь хода входит в хеш позиции
+        if player != self._player:
+            self.hash ^= self._tables.side_key
+            self._player = player
+
+    def sync(self):
+        """Пересчитывает производное состояние (хеш, победителя, кандидатов, оценку, живые окна) по доске."""
+        tables = self._tables
+        size = self.size
+        self.hash = 0 if self.current_player == 1 else tables.side_key
+        self._priority = array("b", bytes(size * size))
+        for cell, player in enumerate(self._cells):
+            if player:
+                self.hash ^= tables.zobrist[2 * cell + (player == -1)]
+                for neighbour, weight in tables.neighbours[cell]:
+                    self._priority[neighbour] += weight
+
+        self._codes = self._window_codes()
+        self.winner = (1 if self._five_code(1) in self._codes else
+                       -1 if self._five_code(-1) in self._codes else 0)
+        self._eval_x, self._eval_o = self._score_windows(self._codes)
+        # Окно живое для игрока, пока в нем нет фигур соперника
+        self._live_x = sum(1 for code in self._codes if not tables.pattern_o_count[code])
+        self._live_o = sum(1 for code in self._codes if not tables.pattern_x_count[code])
+
+    @property
+    def evaluation(self):
+        """Оценка позиции, поддерживаемая инкрементально; совпадает с evaluate_position()."""
+        return self._eval_x if self.current_player == 1 else self._eval_o
+
+    def push(self, move):
+        """Ставит фигуру текущего игрока в клетку move и обновляет производное состояние."""
+        row, col = move
+        cell = row * self.size + col
+        player = self.current_player
+        tables = self._tables
+
+        if self._stack is None:
+            self._stack = []
+        self._stack.append((move, self.winner, self.game_over))
+        if self._place(cell, player) and not self.winner:
+            self.winner = player
+            self.game_over = True
+        elif self.is_draw():
+            self.game_over = True
+        self.current_player = -player
+
+    def pop(self):
+        """Отменяет последний ход, сделанный через push, и возвращает его."""
+        if not self._stack:
+            raise IndexError("pop from empty move stack")
+        move, self.winner, self.game_over = self._stack.pop()
+        row, col = move
+        player = -self.current_player
+        self._remove(row * self.size + col, player)
+        self.current_player = player
+        return move
+
+    def _place(self, cell, player):
+        """Ставит фигуру в пустую клетку. Возвращает True, если собрано пять в ряд."""
+        tables = self._tables
+        self._cells[cell] = player
+        self.hash ^= tables.zobrist[2 * cell + (player == -1)]
+        for neighbour, weight in tables.neighbours[cell]:
+            self._priority[neighbour] += weight
+        self.moves += 1
+        return self._update_windows(cell, player, 1)
+
+    def _remove(self, cell, player):
+        """Убирает фигуру игрока player из клетки."""
+        tables = self._tables
+        self._cells[cell] = 0
+        self.hash ^= tables.zobrist[2 * cell + (player == -1)]
+        for neighbour, weight in tables.neighbours[cell]:
+            self._priority[neighbour] -= weight
+        self.moves -= 1
+        self._update_windows(cell, player, -1)
+
+    def _set_cell(self, cell, player):
+        """Записывает значение клетки напрямую, минуя стек ходов (запись через board)."""
+        if player not in (-1, 0, 1):
+            raise ValueError(f"invalid cell value: {player!r}")
+        old = self._cells[cell]
+        if old == player:
+            return
+        if old:
+            self._remove(cell, old)
+            # Снятая фигура могла входить в единственную пятерку победителя
+            if old == self.winner and self._five_code(old) not in self._codes:
+                self.winner = 0
+        if player and self._place(cell, player) and not self.winner:
+            self.winner = player
+        self.game_over = bool(self.winner) or self.is_draw()
+
+    def _update_windows(self, cell, player, delta):
+        """Обновляет коды, оценку и число живых окон для клетки. Возвращает True, если окно заполнено."""
+        tables = self._tables
+        score_x, score_o = tables.pattern_score_x, tables.pattern_score_o
+        own_count = tables.pattern_x_count if player == 1 else tables.pattern_o_count
+        codes = self._codes
+        digit = delta if player == 1 else 2 * delta
+        five = self._five_code(player)
+        start, end = tables.cell_windows_start[cell], tables.cell_windows_start[cell + 1]
+        eval_x, eval_o = self._eval_x, self._eval_o
+        completed = False
+        # Окна, где это первая (или, при отмене, единственная) фигура игрока, живые для соперника
+        first_stones = 0
+        for window, power in zip(tables.cell_windows[start:end], tables.cell_window_powers[start:end]):
+            code = codes[window]
+            new_code = code + digit * power
+            eval_x += score_x[new_code] - score_x[code]
+            eval_o += score_o[new_code] - score_o[code]
+            if not own_count[min(code, new_code)]:
+                first_stones += 1
+            codes[window] = new_code
+            if new_code == five:
+                completed = True
+        self._eval_x, self._eval_o = eval_x, eval_o
+        if player == 1:
+            self._live_o -= delta * first_stones
+        else:
+            self._live_x -= delta * first_stones
+        return completed
+
+    def _five_code(self, player):
+        """Код окна, полностью занятого фигурами игрока."""
+        return (3 ** self.winning_length - 1) // 2 * (1 if player == 1 else 2)
+
+    def _window_codes(self):
+        """Троичные коды всех окон, подсчитанные по доске."""
+        flat = [value if value != -1 else 2 for value in self._cells]
+        windows = self._tables.windows
+        length = self.winning_length
+        powers = [3 ** i for i in range(length)]
+        codes = array("B")
+        for start in range(0, len(windows), length):
+            codes.append(sum(flat[cell] * power for cell, power in zip(windows[start:start + length], powers)))
+        return codes
+
+    def _score_windows(self, codes):
+        """Суммарная оценка окон для хода крестиков и для хода ноликов."""
+        tables = self._tables
+        return (sum(tables.pattern_score_x[code] for code in codes),
+                sum(tables.pattern_score_o[code] for code in codes))
+
+    def is_draw(self) -> bool:
+        """Ничья: победителя нет, и ни у одного игрока не осталось окна, где можно собрать пять."""
+        return not self.winner and not self._live_x and not self._live_o
+
+    def is_moves_left(self) -> bool:
+        """Проверка, на оставшиеся ходы"""
+        return 0 not in self._cells
+
+    def make_move(self, row, col) -> bool:
+        """Сделать ход."""
+        if self.game_over:
+            return False
+        if self._cells[row * self.size + col] == 0:
+            self.push((row, col))
+            if self.mode != ModeState.player and self.current_player == -1 and not self.game_over:
+                self.make_computer_move()
+            return True
+        return False
+
+    def make_computer_move(self):
+        """Сделать ход компьютера."""
+        if self.mode == ModeState.mcts:
+            # Модуль MCTS с пулом процессов загружается только в этом режиме
+            import mcts
+            row, col = mcts.get_best_move(self, self.mcts_time_limit)
+        else:
+            row, col = self.get_best_move()
+        self.make_move(row, col)
+
+    def evaluate_position(self):
+        """Оценка всех позиций."""
+        # Каждое окно оценивается одним обращением к таблице фигур по его троичному коду
+        score_x, score_o = self._score_windows(self._window_codes())
+        return score_x if self.current_player == 1 else score_o
+
+    def get_valid_moves(self):
+        """Получает список возможных ходов с приоритизацией и исключением бесполезных ходов"""
+        moves = []
+        priority = self._priority
+        cells = self._cells
+        for row in range(self.size):
+            offset = row * self.size
+            for col in range(self.size):
+                # Приоритет клетки поддерживается в push/pop: соседи в радиусе 2,
+                # ближайшие соседи имеют больший вес
+                if cells[offset + col] == 0 and priority[offset + col] > 0:
+                    moves.append((priority[offset + col], row, col))
+
+        moves.sort(reverse=True)
+        return [(row, col) for _, row, col in moves] if moves else [(self.size // 2, self.size // 2)]
+
+    def score_moves(self):
+        """Оценки всех ходов из get_valid_moves за один проход, с точки зрения игрока, чей ход.
+
+        Оценка хода - общая оценка текущей позиции плюс изменение оценок только тех окон,
+        которые проходят через клетку хода; доска при этом не меняется.
+        Оценка evaluation считается с точки зрения X, поэтому оценка хода равна
+        evaluation * player после push(move), где player - игрок, сделавший ход:
+        для хода O знак оценки меняется.
+        """
+        tables = self._tables
+        player = self.current_player
+        # После хода очередь переходит к сопернику, поэтому берется таблица оценок для его хода
+        scores = tables.pattern_score_o if player == 1 else tables.pattern_score_x
+        base = self._eval_o if player == 1 else self._eval_x
+        digit = 1 if player == 1 else 2
+        codes = self._codes
+        scored = []
+        for row, col in self.get_valid_moves():
+            cell = row * self.size + col
+            start, end = tables.cell_windows_start[cell], tables.cell_windows_start[cell + 1]
+            delta = 0
+            for window, power in zip(tables.cell_windows[start:end], tables.cell_window_powers[start:end]):
+                code = codes[window]
+                delta += scores[code + digit * power] - scores[code]
+            scored.append(((row, col), (base + delta) * player))
+        return scored
+
+    def has_neighbor(self, row, col):
+        """Проверка, есть ли рядом фигура."""
+        for dr in [-1, 0, 1]:
+            for dc in [-1, 0, 1]:
+                if dr == 0 and dc == 0:
+                    continue
+                r, c = row + dr, col + dc
+                if (0 <= r < self.size and
+                        0 <= c < self.size and
+                        self._cells[r * self.size + c] != 0):
+                    return True
+        return False
+
+    def minimax(self, depth, alpha=float('-inf'), beta=float('inf'), maximizing_player=False):
+        """Минимакс алгоритм для выбора наилучшего хода."""
+        self.nodes += 1
+        if self.is_draw():
+            return 0, None
+        if self.winner:
+            return self.winner * (self.win_score + depth), None
+        if depth == 0:
+            return self.evaluation, None
+
+        valid_moves = self.get_valid_moves()
+        if not valid_moves:
+            return 0, None
+
+        best_move = None
+        if maximizing_player:
+            max_eval = float('-inf')
+            for move in valid_moves:
+                self.push(move)
+                eval_score, _ = self.minimax(depth - 1, alpha, beta, False)
+                self.pop()
+
+                if eval_score > max_eval:
+                    max_eval = eval_score
+                    best_move = move
+                alpha = max(alpha, eval_score)
+                if beta <= alpha:
+                    break
+            return max_eval, best_move
+        else:
+            min_eval = float('inf')
+            for move in valid_moves:
+                self.push(move)
+                eval_score, _ = self.minimax(depth - 1, alpha, beta, True)
+                self.pop()
+
+                if eval_score < min_eval:
+                    min_eval = eval_score
+                    best_move = move
+                beta = min(beta, eval_score)
+                if beta <= alpha:
+                    break
+            return min_eval, best_move
+
+    def pvs(self, depth, alpha=float('-inf'), beta=float('inf')):
+        """Поиск с нулевым окном (PVS) в форме негамакса.
+
+        Оценка возвращается с точки зрения игрока, чей ход. Первый ход ищется с полным окном,
+        остальные - с нулевым, и перебираются заново только при выходе оценки за alpha.
+        Порядок ходов в корне не меняется, поэтому при равных оценках выбирается тот же ход,
+        что и в minimax.
+        """
+        if self._killers is not None:
+            return self._pvs(depth, alpha, beta, 0)
+        # Отдельный вызов: таблицы поиска живут только до его завершения
+        self._killers, self._hash_moves = [], {}
+        try:
+            return self._pvs(depth, alpha, beta, 0)
+        finally:
+            self._killers = self._hash_moves = None
+
+    def _pvs(self, depth, alpha, beta, ply):
+        self.nodes += 1
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            raise _SearchTimeout
+        if self.is_draw():
+            return 0, None
+        if self.winner:
+            # Партия закончена последним ходом соперника: игрок, чей ход, проиграл
+            return -(self.win_score + depth), None
+        if depth == 0:
+            return self.evaluation * self.current_player, None
+
+        moves = self.get_valid_moves()
+        if ply:
+            # Сначала лучший ход из прошлой итерации для этой позиции, затем ход-убийца этого уровня
+            while len(self._killers) <= ply:
+                self._killers.append(None)
+            for move in (self._killers[ply], self._hash_moves.get(self.hash)):
+                if move in moves:
+                    moves.remove(move)
+                    moves.insert(0, move)
+
+        best_score, best_move = float('-inf'), None
+        for index, move in enumerate(moves):
+            self.push(move)
+            if index == 0:
+                score = -self._pvs(depth - 1, -beta, -alpha, ply + 1)[0]
+            else:
+                score = -self._pvs(depth - 1, -alpha - 1, -alpha, ply + 1)[0]
+                if alpha < score < beta:
+                    score = -self._pvs(depth - 1, -beta, -score, ply + 1)[0]
+            self.pop()
+
+            if score > best_score:
+                best_score, best_move = score, move
+                alpha = max(alpha, score)
+                if alpha >= beta:
+                    if ply:
+                        self._killers[ply] = move
+                    break
+        self._hash_moves[self.hash] = best_move
+        return best_score, best_move
+
+    def get_best_move(self, depth=2, time_limit=None):
+        """Вычисление лучшего хода для компьютера.
+
+        Итеративное углубление до depth (None - без ограничения) с окнами стремления.
+        Если задан time_limit в секундах, поиск прерывается по истечении времени
+        и возвращается ход последней завершенной итерации.
+        """
+        self.nodes = 0
+        self._killers = []
+        self._hash_moves = {}
+        if depth is None:
+            depth = self.size * self.size - self.moves
+        if time_limit is not None:
+            self._deadline = time.monotonic() + time_limit
+        root = self.moves
+        best_move = None
+        try:
+            score, best_move = self.pvs(1)
+            for iteration in range(2, depth + 1):
+                alpha, beta = score - self.aspiration_window, score + self.aspiration_window
+                score, move = self.pvs(iteration, alpha, beta)
+                # Оценка вышла за окно - повторяем поиск, открыв окно с той стороны, где был выход
+                if score <= alpha:
+                    score, move = self.pvs(iteration, float('-inf'), beta)
+                elif score >= beta:
+                    score, move = self.pvs(iteration, alpha, float('inf'))
+                best_move = move
+        except _SearchTimeout:
+            while self.moves > root:
+                self.pop()
+        finally:
+            self._deadline = None
+            self._killers = self._hash_moves = None
+        return best_move or self.get_valid_moves()[0]
+
+    def check_winner(self, player):
+        """Проверка выиграл ли игрок."""
+        return self._five_code(player) in self._window_codes()
+
+
+_PATTERN_TABLES = _pattern_tables(TicTacToe.winning_length)
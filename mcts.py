@@ -0,0 +1,211 @@
+"""Поиск по дереву Монте-Карло (UCT с прогрессивным расширением) для хода компьютера.
+
+Каждый процесс строит свое дерево из одной и той же позиции и выполняет случайные доигрывания
+на битовых досках; статистика ходов корня от всех процессов суммируется. Пул процессов
+создается при первом ходе и используется для всех следующих ходов.
+"""
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import ModeState, TicTacToe
+
+# Коэффициент исследования в формуле UCT
+EXPLORATION = 1.4
+# Прогрессивное расширение: у узла с n посещениями рассматривается 1 + WIDENING * n ** WIDENING_POWER ходов
+WIDENING = 1.0
+WIDENING_POWER = 0.5
+# Как часто сверяться с часами, в итерациях
+CLOCK_CHECK_INTERVAL = 16
+
+_pool = None
+_pool_workers = 0
+
+
+class _Node:
+    __slots__ = ("move", "player", "children", "candidates", "visits", "wins")
+
+    def __init__(self, move, player):
+        self.move = move
+        self.player = player  # Игрок, сделавший ход move
+        self.children = []
+        self.candidates = None
+        self.visits = 0
+        self.wins = 0.0
+
+
+def _winning_cells(bits, free, stride):
+    """Свободные клетки, ход в которые дает пять в ряд (битовая доска с дополнительным пустым столбцом)."""
+    cells = 0
+    for shift in (1, stride, stride + 1, stride - 1):
+        after1, after2, after3, after4 = (bits >> shift, bits >> 2 * shift,
+                                          bits >> 3 * shift, bits >> 4 * shift)
+        before1, before2, before3, before4 = (bits << shift, bits << 2 * shift,
+                                              bits << 3 * shift, bits << 4 * shift)
+        cells |= ((after1 & after2 & after3 & after4) | (before1 & after1 & after2 & after3) |
+                  (before2 & before1 & after1 & after2) | (before3 & before2 & before1 & after1) |
+                  (before4 & before3 & before2 & before1))
+    return cells & free
+
+
+def _playout(own, other, free, empty, stride, rng):
+    """Доигрывание: выигрыш, если он есть, иначе защита от выигрыша соперника, иначе случайный ход.
+
+    own - фигуры игрока, чей ход; free - маска свободных клеток, empty - их номера.
+    Возвращает 1 или -1 с точки зрения игрока, чей ход, или 0 при ничьей.
+    """
+    rng.shuffle(empty)
+    index = 0
+    sign = 1
+    while free:
+        if _winning_cells(own, free, stride):
+            return sign
+        threats = _winning_cells(other, free, stride)
+        if threats:
+            bit = threats & -threats
+        else:
+            while not free >> empty[index] & 1:
+                index += 1
+            bit = 1 << empty[index]
+        own |= bit
+        free ^= bit
+        own, other = other, own
+        sign = -sign
+    return 0
+
+
+def _ordered_candidates(game):
+    """Ходы из get_valid_moves, упорядоченные по оценке позиции после хода."""
+    scored = sorted(game.score_moves(), key=lambda item: item[1], reverse=True)
+    return [move for move, _ in scored]
+
+
+def _search(board, player, deadline, seed):
+    """Строит дерево до момента deadline (time.monotonic()) и возвращает {ход: (посещения, выигрыши)} корня."""
+    rng = random.Random(seed)
+    size = len(board)
+    stride = size + 1
+    game = TicTacToe(size, mode=ModeState.player)
+    for row in range(size):
+        for col in range(size):
+            if board[row][col]:
+                game.board[row][col] = board[row][col]
+    game.current_player = player
+
+    root_bits = {1: 0, -1: 0}
+    positions = []
+    board_mask = 0
+    for row in range(size):
+        for col in range(size):
+            if board[row][col]:
+                root_bits[board[row][col]] |= 1 << (row * stride + col)
+            positions.append(row * stride + col)
+            board_mask |= 1 << (row * stride + col)
+
+    root = _Node(None, -player)
+    iterations = 0
+    while iterations % CLOCK_CHECK_INTERVAL or time.monotonic() < deadline:
+        iterations += 1
+        bits = dict(root_bits)
+        node = root
+        path = [root]
+
+        # Выбор и расширение
+        while not game.winner and not game.is_draw():
+            if node.candidates is None:
+                node.candidates = _ordered_candidates(game)
+            allowed = min(len(node.candidates), 1 + int(WIDENING * node.visits ** WIDENING_POWER))
+            if len(node.children) < allowed:
+                child = _Node(node.candidates[len(node.children)], game.current_player)
+                node.children.append(child)
+            else:
+                log_visits = math.log(node.visits)
+                child = max(node.children, key=lambda item: item.wins / item.visits +
+                            EXPLORATION * math.sqrt(log_visits / item.visits))
+            row, col = child.move
+            bits[game.current_player] |= 1 << (row * stride + col)
+            game.push(child.move)
+            path.append(child)
+            node = child
+            if child.visits == 0:
+                break
+
+        # Доигрывание
+        if game.winner:
+            result = game.winner
+        elif game.is_draw():
+            result = 0
+        else:
+            free = board_mask & ~(bits[1] | bits[-1])
+            empty = [position for position in positions if free >> position & 1]
+            side = game.current_player
+            result = _playout(bits[side], bits[-side], free, empty, stride, rng) * side
+
+        # Обратное распространение
+        for _ in range(len(path) - 1):
+            game.pop()
+        for visited in path:
+            visited.visits += 1
+            if result == visited.player:
+                visited.wins += 1
+            elif result == 0:
+                visited.wins += 0.5
+
+    return {child.move: (child.visits, child.wins) for child in root.children}
+
+
+def _ready():
+    """Пустая задача: дожидается запуска процесса пула."""
+
+
+def _get_pool(workers):
+    """Пул из workers процессов, общий для всех ходов; процессы запускаются сразу при создании."""
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        shutdown_pool()
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+        # Запуск процессов (при spawn - с повторным импортом модулей) не должен расходовать время хода
+        for future in [_pool.submit(_ready) for _ in range(workers)]:
+            future.result()
+    return _pool
+
+
+def shutdown_pool():
+    """Останавливает общий пул процессов, если он был создан."""
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown()
+        _pool, _pool_workers = None, 0
+
+
+def root_statistics(game, time_limit, workers=None):
+    """Суммарная статистика ходов корня {ход: [посещения, выигрыши]} от всех процессов."""
+    board = [list(row) for row in game.board]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        results = [_search(board, game.current_player, time.monotonic() + time_limit, 0)]
+    else:
+        pool = _get_pool(workers)
+        # Отсчет времени начинается, когда пул уже готов
+        deadline = time.monotonic() + time_limit
+        results = list(pool.map(_search, [board] * workers, [game.current_player] * workers,
+                                [deadline] * workers, range(workers)))
+
+    stats = {}
+    for result in results:
+        for move, (visits, wins) in result.items():
+            total = stats.setdefault(move, [0, 0.0])
+            total[0] += visits
+            total[1] += wins
+    return stats
+
+
+def get_best_move(game, time_limit, workers=None):
+    """Ход с наибольшим числом посещений за time_limit секунд поиска в workers процессах."""
+    stats = root_statistics(game, time_limit, workers)
+    if not stats:
+        return game.get_valid_moves()[0]
+    return max(stats, key=lambda move: stats[move][0])
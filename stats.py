@@ -0,0 +1,80 @@
+import bisect
+import json
+import os
+from enum import Enum
+
+
+class GameResult(Enum):
+    """Результат партии для игрока; значение - имя счетчика в статистике."""
+    win = "wins"
+    loss = "losses"
+    draw = "draws"
+
+
+class StatsService:
+    """Статистика игроков со сводными показателями и индексом таблицы лидеров.
+
+    Для каждого игрока хранятся только накопленные показатели, поэтому запись партии
+    не требует просмотра истории. Таблица лидеров - отсортированный список ключей,
+    поиск места игрока в нем выполняется двоичным поиском.
+
+    Запись партии стоит O(N) по числу игроков: ключ игрока удаляется из списка и вставляется
+    заново со сдвигом элементов, а stats.json после каждой партии перезаписывается целиком.
+    """
+
+    def __init__(self):
+        self.stats_file = "stats.json"
+        self.stats = {}
+        self.leaderboard = []
+        self.load_stats()
+
+    @staticmethod
+    def leaderboard_key(username, stats):
+        """Ключ сортировки таблицы лидеров: больше побед, затем меньше поражений, затем по имени."""
+        return -stats["wins"], stats["losses"], username
+
+    def record_game(self, username, result: GameResult, moves, duration):
+        """Учитывает завершенную партию игрока: результат, число ходов и длительность в секундах."""
+        stats = self.stats.get(username)
+        if stats is None:
+            stats = self.stats[username] = {
+                "games": 0, "wins": 0, "losses": 0, "draws": 0, "total_moves": 0, "best_time": None
+            }
+        else:
+            self.leaderboard.pop(self.rank(username) - 1)
+
+        stats["games"] += 1
+        stats[result.value] += 1
+        stats["total_moves"] += moves
+        if result == GameResult.win and (stats["best_time"] is None or duration < stats["best_time"]):
+            stats["best_time"] = duration
+
+        bisect.insort(self.leaderboard, self.leaderboard_key(username, stats))
+        self.save_stats()
+
+    def get_stats(self, username):
+        """Статистика игрока с вычисленной средней длиной партии или None, если партий не было."""
+        stats = self.stats.get(username)
+        if stats is None:
+            return None
+        return dict(stats, average_moves=stats["total_moves"] / stats["games"])
+
+    def rank(self, username):
+        """Место игрока в таблице лидеров (с 1) или None, если партий не было."""
+        if username not in self.stats:
+            return None
+        return bisect.bisect_left(self.leaderboard, self.leaderboard_key(username, self.stats[username])) + 1
+
+    def top(self, count=10):
+        """Первые count игроков таблицы лидеров: список пар (имя, статистика)."""
+        return [(username, self.get_stats(username)) for _, _, username in self.leaderboard[:count]]
+
+    def save_stats(self):
+        with open(self.stats_file, "w") as f:
+            json.dump(self.stats, f)
+
+    def load_stats(self):
+        if os.path.exists(self.stats_file):
+            with open(self.stats_file, "r") as f:
+                self.stats = json.load(f)
+        self.leaderboard = sorted(self.leaderboard_key(username, stats) for username, stats in self.stats.items())
@@ -1,7 +1,14 @@
+import json
 import os
+import subprocess
+import sys
+import tracemalloc
 import unittest
 
+import mcts
 from main import TicTacToe, ModeState, AuthService
+from stats import GameResult, StatsService
+from worker import best_move
 
 
 class TestAuthService(unittest.TestCase):
@@ -65,6 +72,59 @@ class TestAuthService(unittest.TestCase):
         self.assertIn("testuser", new_service.users)
 
 
+class TestStatsService(unittest.TestCase):
+    def setUp(self):
+        self.stats_service = StatsService()
+        self.test_stats_file = "test_stats.json"
+        self.stats_service.stats_file = self.test_stats_file
+        self.stats_service.stats = {}
+        self.stats_service.leaderboard = []
+
+    def tearDown(self):
+        # Удаляем тестовый файл после тестов
+        if os.path.exists(self.test_stats_file):
+            os.remove(self.test_stats_file)
+
+    def test_record_game(self):
+        # Сводные показатели обновляются после каждой партии
+        self.stats_service.record_game("testuser", GameResult.win, 20, 90)
+        self.stats_service.record_game("testuser", GameResult.win, 10, 45)
+        self.stats_service.record_game("testuser", GameResult.loss, 30, 30)
+        self.stats_service.record_game("testuser", GameResult.draw, 40, 120)
+
+        stats = self.stats_service.get_stats("testuser")
+        self.assertEqual((stats["wins"], stats["losses"], stats["draws"]), (2, 1, 1))
+        self.assertEqual(stats["average_moves"], 25)
+        # Лучшее время учитывается только для побед
+        self.assertEqual(stats["best_time"], 45)
+        self.assertIsNone(self.stats_service.get_stats("nonexistent"))
+
+    def test_leaderboard(self):
+        # Порядок: больше побед, затем меньше поражений
+        self.stats_service.record_game("first", GameResult.win, 10, 10)
+        self.stats_service.record_game("second", GameResult.loss, 10, 10)
+        self.stats_service.record_game("third", GameResult.draw, 10, 10)
+        self.stats_service.record_game("second", GameResult.win, 10, 10)
+        self.stats_service.record_game("second", GameResult.win, 10, 10)
+
+        self.assertEqual([username for username, _ in self.stats_service.top()], ["second", "first", "third"])
+        self.assertEqual([username for username, _ in self.stats_service.top(1)], ["second"])
+        self.assertEqual(self.stats_service.rank("third"), 3)
+        self.assertIsNone(self.stats_service.rank("nonexistent"))
+
+    def test_save_load_stats(self):
+        # Тест сохранения и загрузки статистики вместе с таблицей лидеров
+        self.stats_service.record_game("testuser", GameResult.win, 10, 10)
+        self.stats_service.record_game("otheruser", GameResult.loss, 10, 10)
+
+        new_service = StatsService()
+        new_service.stats_file = self.test_stats_file
+        new_service.load_stats()
+
+        self.assertEqual(new_service.get_stats("testuser"), self.stats_service.get_stats("testuser"))
+        self.assertEqual(new_service.rank("otheruser"), 2)
+
+
 class TestTicTacToe(unittest.TestCase):
     def setUp(self):
         # Создаем две игры с разными режимами для тестирования
@@ -197,6 +257,291 @@ class TestTicTacToe(unittest.TestCase):
         moves = self.game_vs_computer.get_valid_moves()
         self.assertTrue(len(moves) > 1)
 
+    def test_push_pop(self):
+        """Тест хода и его отмены через push/pop"""
+        game = self.game_vs_player
+        game.push((5, 5))
+        game.push((5, 6))
+        board = [list(row) for row in game.board]
+        state = (game.hash, game.evaluation, game.get_valid_moves(), game.current_player, game.moves)
+
+        game.push((4, 4))
+        self.assertEqual(game.evaluation, game.evaluate_position())
+        self.assertEqual(game.pop(), (4, 4))
+
+        self.assertEqual([list(row) for row in game.board], board)
+        self.assertEqual((game.hash, game.evaluation, game.get_valid_moves(), game.current_player, game.moves),
+                         state)
+
+    def test_push_winning_move(self):
+        """Тест обновления флага победы при push и его отмены при pop"""
+        game = self.game_vs_player
+        for i in range(4):
+            game.push((0, i))
+            game.push((1, i))
+        game.push((0, 4))
+        self.assertEqual(game.winner, 1)
+        self.assertTrue(game.game_over)
+
+        game.pop()
+        self.assertEqual(game.winner, 0)
+        self.assertFalse(game.game_over)
+
+    def test_slots(self):
+        """Тест компактного хранения состояния игры"""
+        self.assertFalse(hasattr(self.game_vs_player, "__dict__"))
+
+    def test_memory_per_game(self):
+        """Тест объема памяти одной игры: поле - один плоский массив, таблицы поиска не создаются заранее"""
+        tracemalloc.start()
+        try:
+            games = [TicTacToe(10, mode=ModeState.player) for _ in range(200)]
+            per_game = tracemalloc.get_traced_memory()[0] / len(games)
+        finally:
+            tracemalloc.stop()
+        self.assertLess(per_game, 1200)
+        self.assertIsNone(games[0]._stack)
+        self.assertIsNone(games[0]._hash_moves)
+
+    def test_search_tables_released(self):
+        """Тест освобождения таблиц поиска после вычисления хода"""
+        game = self.game_vs_computer
+        game.make_move(5, 5)
+        game.get_best_move(depth=3)
+        self.assertIsNone(game._killers)
+        self.assertIsNone(game._hash_moves)
+        game.get_best_move(depth=None, time_limit=0.05)
+        self.assertIsNone(game._killers)
+        self.assertIsNone(game._hash_moves)
+
+    def test_window_tables(self):
+        """Тест общих таблиц окон для поля одного размера"""
+        tables = self.game_vs_player._tables
+        self.assertIs(tables, self.game_vs_computer._tables)
+        # 6 окон в каждой из 10 строк и 10 столбцов и по 36 на каждое диагональное направление
+        self.assertEqual(len(tables.windows) // 5, 2 * 60 + 2 * 36)
+        # Угловая клетка входит в одно горизонтальное, одно вертикальное и одно диагональное окно
+        self.assertEqual(tables.cell_windows_start[1] - tables.cell_windows_start[0], 3)
+
+    def test_search_plays_win(self):
+        """Тест, что поиск на любой глубине выбирает немедленный выигрыш, а не защиту"""
+        moves = [(5, 1), (0, 0), (5, 2), (0, 1), (5, 3), (0, 2), (5, 4), (0, 3)]
+        for search in (lambda game: game.get_best_move(3),
+                       lambda game: game.get_best_move(depth=None, time_limit=0.3),
+                       lambda game: game.minimax(3, maximizing_player=True)[1]):
+            game = TicTacToe(mode=ModeState.player)
+            for move in moves:
+                game.push(move)
+            self.assertIn(search(game), [(5, 0), (5, 5)])
+
+    def test_large_board(self):
+        """Тест поля, на котором номера окон не помещаются в 16 бит"""
+        game = TicTacToe(61, mode=ModeState.player)
+        for i in range(5):
+            game.push((60, 56 + i))
+            if i < 4:
+                game.push((0, i))
+        self.assertEqual(game.winner, 1)
+        # Таблицы фигур не зависят от размера поля и общие для всех размеров
+        self.assertIs(game._tables.pattern_score_x, self.game_vs_player._tables.pattern_score_x)
+
+    def test_evaluation_matches_full_scan(self):
+        """Тест совпадения инкрементальной оценки с полным пересчетом"""
+        game = self.game_vs_player
+        for move in [(5, 5), (5, 6), (4, 4), (6, 6), (3, 3), (2, 2), (4, 5)]:
+            game.push(move)
+            self.assertEqual(game.evaluation, game.evaluate_position())
+
+    def test_block_broken_four(self):
+        """Тест блокировки разорванной четверки XX_XX"""
+        game = self.game_vs_player
+        for move in [(5, 1), (0, 9), (5, 2), (9, 0), (5, 4), (9, 9), (5, 5)]:
+            game.push(move)
+        self.assertEqual(game.get_best_move(), (5, 3))
+
+    def test_pattern_scores(self):
+        """Тест таблицы оценок фигур по троичному коду окна"""
+        tables = self.game_vs_player._tables
+        open_three = 3 + 9 + 27  # _XXX_
+        edge_three = 1 + 3 + 9  # XXX__
+        self.assertGreater(tables.pattern_score_x[open_three], tables.pattern_score_x[edge_three])
+        # Те же фигуры ноликов оцениваются симметрично
+        self.assertEqual(tables.pattern_score_o[2 * open_three], -tables.pattern_score_x[open_three])
+        # Окно с фигурами обоих игроков не оценивается
+        self.assertEqual(tables.pattern_score_x[1 + 2 * 3], 0)
+
+    def test_pvs_matches_minimax(self):
+        """Тест совпадения хода PVS с минимаксом при меньшем числе узлов"""
+        game = self.game_vs_player
+        for move in [(5, 5), (4, 4), (4, 5), (6, 5), (3, 5), (2, 5), (4, 6), (4, 3), (3, 4), (5, 4)]:
+            game.push(move)
+        game.nodes = 0
+        score, move = game.minimax(3, maximizing_player=True)
+        minimax_nodes = game.nodes
+
+        self.assertEqual(game.get_best_move(3), move)
+        self.assertLess(game.nodes, minimax_nodes)
+        self.assertEqual(game.pvs(3)[0], score)
+
+    def test_best_move_time_limit(self):
+        """Тест поиска с ограничением по времени"""
+        game = self.game_vs_player
+        for move in [(5, 5), (4, 4), (5, 6)]:
+            game.push(move)
+        board = [list(row) for row in game.board]
+
+        row, col = game.get_best_move(depth=None, time_limit=0.05)
+        self.assertEqual(game.board[row][col], 0)
+        # Прерванный поиск не оставляет ходов на доске
+        self.assertEqual([list(row) for row in game.board], board)
+        self.assertEqual(game.moves, 3)
+
+    def test_board_writes(self):
+        """Тест, что запись в клетку через board обновляет производное состояние"""
+        game = self.game_vs_player
+        for i in range(4):
+            game.board[5][i + 1] = 1
+        self.assertEqual(game.moves, 4)
+        self.assertEqual(game.evaluation, game.evaluate_position())
+        self.assertIn((5, 0), game.get_valid_moves())
+        self.assertIn(game.get_best_move(depth=1), [(5, 0), (5, 5)])
+
+        game.board[5][5] = 1
+        self.assertEqual(game.winner, 1)
+        self.assertTrue(game.game_over)
+        game.board[5][-6] = 0
+        self.assertEqual(game.winner, 0)
+        self.assertFalse(game.game_over)
+
+        expected = TicTacToe(mode=ModeState.player)
+        for col in (1, 2, 3, 5):
+            expected.board[5][col] = 1
+        self.assertEqual(game.hash, expected.hash)
+        with self.assertRaises(ValueError):
+            game.board[0][0] = 2
+
+    def test_early_draw(self):
+        """Тест досрочной ничьей, когда ни у кого не осталось окна для пяти в ряд"""
+        game = self.game_vs_player
+        # Узор XXOO со сдвигом на две клетки в каждой строке перекрывает все окна
+        for i in range(game.size):
+            for j in range(game.size):
+                game.board[i][j] = 1 if (j + 2 * i) % 4 < 2 else -1
+        for i, j in [(0, 0), (4, 7), (9, 9)]:
+            game.board[i][j] = 0
+
+        self.assertFalse(game.is_moves_left())
+        self.assertTrue(game.is_draw())
+        self.assertEqual(game.minimax(2), (0, None))
+
+    def test_draw_after_push(self):
+        """Тест отслеживания живых окон при push/pop"""
+        game = self.game_vs_player
+        crosses = [(i, j) for i in range(game.size) for j in range(game.size) if (j + 2 * i) % 4 < 2]
+        noughts = [(i, j) for i in range(game.size) for j in range(game.size) if (j + 2 * i) % 4 >= 2]
+        for cross, nought in zip(crosses, noughts):
+            if game.game_over:
+                break
+            game.push(cross)
+            game.push(nought)
+        self.assertTrue(game.is_draw())
+        self.assertLess(game.moves, game.size * game.size)
+
+        while game.moves:
+            game.pop()
+        self.assertFalse(game.is_draw())
+
+    def test_score_moves(self):
+        """Тест оценки всех ходов-кандидатов за один проход"""
+        game = self.game_vs_player
+        for move in [(5, 5), (4, 4), (5, 6), (3, 3), (6, 6), (4, 5)]:
+            game.push(move)
+        # Проверяем ход X, затем ход O: оценка дается с точки зрения игрока, чей ход
+        for player in (1, -1):
+            if player == -1:
+                game.push((5, 4))
+            self.assertEqual(game.current_player, player)
+            scored = game.score_moves()
+            self.assertEqual([move for move, _ in scored], game.get_valid_moves())
+            for move, score in scored:
+                game.push(move)
+                self.assertEqual(game.evaluation * player, score)
+                game.pop()
+
+
+class TestMCTS(unittest.TestCase):
+    def setUp(self):
+        self.game = TicTacToe(mode=ModeState.mcts)
+
+    def play(self, moves):
+        for move in moves:
+            self.game.push(move)
+
+    def test_block_four(self):
+        """Тест блокировки разорванной четверки"""
+        self.play([(5, 1), (0, 9), (5, 2), (9, 0), (5, 4), (9, 9), (5, 5)])
+        self.assertEqual(mcts.get_best_move(self.game, 0.3, workers=1), (5, 3))
+
+    def test_winning_move(self):
+        """Тест выигрышного хода"""
+        self.play([(5, 1), (4, 1), (5, 2), (4, 2), (5, 3), (4, 3), (5, 4), (4, 4)])
+        self.assertIn(mcts.get_best_move(self.game, 0.3, workers=1), [(5, 0), (5, 5)])
+
+    def test_parallel_statistics(self):
+        """Тест объединения статистики корня от нескольких процессов"""
+        self.play([(5, 5)])
+        stats = mcts.root_statistics(self.game, 0.3, workers=2)
+        self.assertTrue(stats)
+        for (row, col), (visits, wins) in stats.items():
+            self.assertEqual(self.game.board[row][col], 0)
+            self.assertLessEqual(wins, visits)
+
+    def test_pool_reused(self):
+        """Тест, что пул процессов создается один раз и используется для следующих ходов"""
+        self.addCleanup(mcts.shutdown_pool)
+        self.play([(5, 5)])
+        mcts.root_statistics(self.game, 0.1, workers=2)
+        pool = mcts._pool
+        self.play([(4, 4)])
+        mcts.root_statistics(self.game, 0.1, workers=2)
+        self.assertIs(mcts._pool, pool)
+
+
+class TestHeadless(unittest.TestCase):
+    def test_no_tkinter_import(self):
+        """Тест, что движок и точка входа загружаются без tkinter"""
+        result = subprocess.run(
+            [sys.executable, "-c", "import sys, main, worker; print('tkinter' in sys.modules)"],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        self.assertEqual(result.stdout.strip(), "False")
+
+    def test_worker_best_move(self):
+        """Тест вычисления хода консольным вычислителем"""
+        moves = [[0, 0], [1, 0], [0, 1], [1, 1], [0, 2], [1, 2], [0, 3], [1, 3]]
+        self.assertEqual(best_move({"size": 10, "moves": moves}), [0, 4])
+
+    def test_worker_invalid_input(self):
+        """Тест отказа вычислителя на некорректных позициях"""
+        for position in ({"moves": [[5, 5], [5, 5]]}, {"moves": [[-1, 0]]}, {"moves": [[0, 10]]},
+                         {"moves": [[5]]}, {"size": "10"}, [[5, 5]], {"moves": None}, {"moves": 5},
+                         {"size": 300}, {"size": 4}):
+            with self.assertRaises(ValueError):
+                best_move(position)
+
+    def test_worker_error_lines(self):
+        """Тест, что ошибка в строке не останавливает обработку следующих строк"""
+        result = subprocess.run(
+            [sys.executable, "worker.py"],
+            input='{"moves": [[5, 5], [5, 5]]}\nnot json\n{"moves": [[5, 5]]}\n',
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        lines = result.stdout.splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn("error", lines[0])
+        self.assertIn("error", lines[1])
+        self.assertEqual(len(json.loads(lines[2])), 2)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,536 @@
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from auth import AuthService
+from engine import ModeState, TicTacToe
+from stats import GameResult, StatsService
+
+
+class AuthWindow(tk.Toplevel):
+    def __init__(self, root):
+        super().__init__(root)
+        self.root = root
+        self.resizable(False, False)
+        self.grab_set()
+        self.focus_set()
+        self.transient(root)
+        w, h = 300, 400
+        ws = root.winfo_screenwidth()
+        hs = root.winfo_screenheight()
+        x = (ws / 2) - (w / 2)
+        y = (hs / 2) - (h / 2)
+        self.geometry('%dx%d+%d+%d' % (w, h, x, y))
+
+        self.auth_service = AuthService()
+
+        self.main_frame = tk.Frame(self)
+        self.main_frame.pack(expand=True, fill='both', padx=20, pady=20)
+
+        self.fields = {}
+
+    def create_field(self, label, field):
+        frame = tk.Frame(self.main_frame)
+        frame.pack(fill=tk.X, pady=10)
+
+        label = tk.Label(frame, text=label)
+        label.pack(anchor=tk.W)
+
+        entry = tk.Entry(frame)
+        entry.pack(fill=tk.X, expand=True)
+
+        error_label = tk.Label(frame, text="", fg="red")
+        error_label.pack(anchor=tk.W)
+
+        self.fields[field] = (entry, error_label)
+
+    def get_field(self, field):
+        return self.fields[field][0].get()
+
+    def hide_input(self, field):
+        self.fields[field][0].config(show="*")
+
+    def show_input(self, field):
+        self.fields[field][0].config(show="")
+
+    def show_error(self, field, message):
+        self.fields[field][1].config(text=message)
+
+    def clear_error(self, field):
+        self.fields[field][1].config(text="")
+
+
+class LoginWindow(AuthWindow):
+    def __init__(self, root, on_success=None):
+        super().__init__(root)
+        self.title("Авторизация")
+
+        self.create_field("Имя пользователя:", "username")
+        self.create_field("Пароль:", "password")
+        self.hide_input("password")
+        self.on_success = on_success
+
+        show_password_var = tk.BooleanVar()
+        show_password_checkbox = tk.Checkbutton(
+            self.main_frame,
+            text="Показать пароль",
+            variable=show_password_var,
+            command=lambda: self.toggle_password_visibility(show_password_var.get())
+        )
+        show_password_checkbox.pack(anchor=tk.W, pady=10)
+
+        buttons_frame = tk.Frame(self.main_frame)
+        buttons_frame.pack(pady=20)
+
+        self.login_button = ttk.Button(buttons_frame, text="Войти", command=self.login)
+        self.login_button.pack(side=tk.LEFT, padx=5)
+
+        self.register_button = ttk.Button(buttons_frame, text="Регистрация",
+                                         command=self.show_register)
+        self.register_button.pack(side=tk.LEFT, padx=5)
+
+    def toggle_password_visibility(self, show_password):
+        if show_password:
+            self.show_input("password")
+        else:
+            self.hide_input("password")
+
+    def login(self):
+        username = self.get_field("username")
+        password = self.get_field("password")
+
+        self.clear_error("username")
+        self.clear_error("password")
+
+        if not username:
+            self.show_error("username", "Введите имя пользователя")
+            return
+        if not password:
+            self.show_error("password", "Введите пароль")
+            return
+
+        success, message = self.auth_service.login(username, password)
+        if success:
+            if self.on_success:
+                self.on_success(username)
+            self.destroy()
+        else:
+            if "пользователя" in message:
+                self.show_error("username", message)
+            else:
+                self.show_error("password", message)
+
+    def show_register(self):
+        self.destroy()
+        RegisterWindow(self.root, self.on_success)
+
+
+class RegisterWindow(AuthWindow):
+    def __init__(self, root, on_success=None):
+        super().__init__(root)
+        self.title("Регистрация")
+        self.geometry("300x400")
+        self.on_success = on_success
+
+        self.create_field("Имя пользователя:", "username")
+        self.create_field("Пароль:", "password")
+        self.create_field("Подтвердите пароль:", "confirm_password")
+
+        self.hide_input("password")
+        self.hide_input("confirm_password")
+
+        show_password_var = tk.BooleanVar()
+        show_password_checkbox = tk.Checkbutton(
+            self.main_frame,
+            text="Показать пароль",
+            variable=show_password_var,
+            command=lambda: self.toggle_password_visibility(show_password_var.get())
+        )
+        show_password_checkbox.pack(anchor=tk.W, pady=10)
+
+        buttons_frame = tk.Frame(self.main_frame)
+        buttons_frame.pack(pady=20)
+
+        self.register_button = ttk.Button(buttons_frame, text="Зарегистрироваться", command=self.register_user)
+        self.register_button.pack(padx=5, pady=5)
+
+        self.back_button = ttk.Button(buttons_frame, text="Назад", command=self.back_to_login)
+        self.back_button.pack(padx=5)
+
+    def toggle_password_visibility(self, show_password):
+        if show_password:
+            self.show_input("password")
+            self.show_input("confirm_password")
+        else:
+            self.hide_input("password")
+            self.hide_input("confirm_password")
+
+    def register_user(self):
+        username = self.get_field("username")
+        password = self.get_field("password")
+        confirm_password = self.get_field("confirm_password")
+
+        for field in self.fields:
+            self.clear_error(field)
+
+        if not username:
+            self.show_error("username", "Введите имя пользователя")
+            return
+        if len(username) < 3:
+            self.show_error("username", "Имя пользователя должно быть не менее 3 символов")
+            return
+
+        if not password:
+            self.show_error("password", "Введите пароль")
+            return
+        if len(password) < 6:
+            self.show_error("password", "Пароль должен быть не менее 6 символов")
+            return
+
+        if not confirm_password:
+            self.show_error("confirm_password", "Подтвердите пароль")
+            return
+
+        success, message = self.auth_service.register(username, password, confirm_password)
+        if success:
+            messagebox.showinfo("Успех", message)
+            self.back_to_login()
+        else:
+            if "пользователя" in message:
+                self.show_error("username", message)
+            elif "Пароли" in message:
+                self.show_error("confirm_password", message)
+            else:
+                self.show_error("password", message)
+
+    def back_to_login(self):
+        self.destroy()
+        LoginWindow(self.root, self.on_success)
+
+
+class TicTacToeApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Крестики-Нолики до 5 в ряд")
+
+        self.game = TicTacToe()
+        self.cell_size = 65
+        self.game_mode = ModeState.computer
+        self.start_time = None
+        self.timer_id = None
+        self.label_texts = {}
+        self.username = None
+        self.stats_service = StatsService()
+
+        self.sidebar_frame = tk.Frame(self.root, width=200)
+        self.sidebar_frame.pack(side=tk.LEFT, fill=tk.Y)
+        self.sidebar_frame.pack_propagate(False)
+
+        self.main_frame = tk.Frame(self.root, padx=10, pady=10)
+        self.main_frame.pack(expand=True, fill=tk.BOTH)
+
+        settings_frame = tk.LabelFrame(self.sidebar_frame, text="Настройки игры", padx=10, pady=5)
+        settings_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        self.mode_label = tk.Label(settings_frame, text="Режим игры:")
+        self.mode_label.pack(anchor=tk.W, pady=(5, 0))
+
+        self.mode_var = tk.StringVar(value=ModeState.computer.value)
+        self.mode_menu = ttk.OptionMenu(
+            settings_frame,
+            self.mode_var,
+            ModeState.computer.value,
+            *[mode.value for mode in ModeState],
+            command=self.change_mode
+        )
+        self.mode_menu.pack(fill=tk.X, pady=(0, 10))
+
+        self.hints_var = tk.BooleanVar(value=False)
+        self.hints_checkbox = tk.Checkbutton(
+            settings_frame,
+            text="Подсказки",
+            variable=self.hints_var,
+            command=self.draw_board
+        )
+        self.hints_checkbox.pack(anchor=tk.W, pady=(0, 5))
+
+        control_frame = tk.LabelFrame(self.sidebar_frame, text="Управление", padx=10, pady=5)
+        control_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        self.reset_button = ttk.Button(control_frame, text="Новая игра", command=self.reset_game)
+        self.reset_button.pack(fill=tk.X, pady=5)
+
+        stats_frame = tk.LabelFrame(self.sidebar_frame, text="Статистика", padx=10, pady=5)
+        stats_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        self.status_var = tk.StringVar(value="Ход: X")
+        self.status_label = tk.Label(stats_frame, textvariable=self.status_var)
+        self.status_label.pack(anchor=tk.W, pady=5)
+
+        self.moves_var = tk.StringVar(value="Ходов: 0")
+        self.moves_label = tk.Label(stats_frame, textvariable=self.moves_var)
+        self.moves_label.pack(anchor=tk.W, pady=5)
+
+        self.time_var = tk.StringVar(value="Время: 00:00")
+        self.time_label = tk.Label(stats_frame, textvariable=self.time_var)
+        self.time_label.pack(anchor=tk.W, pady=5)
+
+        player_frame = tk.LabelFrame(self.sidebar_frame, text="Игрок", padx=10, pady=5)
+        player_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        self.player_name_var = tk.StringVar(value="Гость")
+        self.player_label = tk.Label(player_frame, textvariable=self.player_name_var)
+        self.player_label.pack(anchor=tk.W, pady=5)
+
+        self.player_stats_var = tk.StringVar(value="")
+        self.player_stats_label = tk.Label(player_frame, textvariable=self.player_stats_var, justify=tk.LEFT,
+                                           wraplength=170)
+        self.player_stats_label.pack(anchor=tk.W, pady=5)
+
+        self.leaderboard_button = ttk.Button(player_frame, text="Таблица лидеров", command=self.show_leaderboard)
+        self.leaderboard_button.pack(fill=tk.X, pady=5)
+
+        self.logout_button = ttk.Button(player_frame, text="Выйти", command=self.logout)
+        self.logout_button.pack(fill=tk.X, pady=5)
+
+        canvas_size = self.cell_size * self.game.size
+        self.canvas = tk.Canvas(
+            self.main_frame,
+            width=canvas_size,
+            height=canvas_size,
+            bg="white"
+        )
+        self.canvas.pack()
+        self.canvas.bind("<Button-1>", self.on_click)
+
+        self.draw_board()
+        self.start_clock()
+
+        self.root.eval('tk::PlaceWindow . center')
+
+        LoginWindow(self.root, self.on_login)
+
+    def draw_board(self):
+        """Отрисовка игрового поля."""
+        self.canvas.delete("all")
+
+        if self.hints_var.get() and not self.game.game_over:
+            self.draw_heatmap()
+
+        for i in range(self.game.size + 1):
+            self.canvas.create_line(
+                i * self.cell_size, 0,
+                i * self.cell_size, self.game.size * self.cell_size,
+                fill="gray"
+            )
+            self.canvas.create_line(
+                0, i * self.cell_size,
+                   self.game.size * self.cell_size, i * self.cell_size,
+                fill="gray"
+            )
+
+        for row in range(self.game.size):
+            for col in range(self.game.size):
+                if self.game.board[row][col] == 1:
+                    self.draw_player(row, col)
+                elif self.game.board[row][col] == -1:
+                    self.draw_opponent(row, col)
+
+    def draw_heatmap(self):
+        """Отрисовка подсказок: чем сильнее ход, тем насыщеннее цвет клетки."""
+        scores = self.game.score_moves()
+        # Цвет зависит от места оценки среди различных оценок, а не от ее величины,
+        # так как оценки угроз на порядки больше остальных
+        levels = sorted(set(score for _, score in scores))
+        rank = {score: index for index, score in enumerate(levels)}
+        for (row, col), score in scores:
+            strength = (rank[score] + 1) / len(levels)
+            x = col * self.cell_size
+            y = row * self.cell_size
+            self.canvas.create_rectangle(
+                x, y,
+                x + self.cell_size, y + self.cell_size,
+                fill=self.heat_color(strength),
+                outline=""
+            )
+
+    @staticmethod
+    def heat_color(strength):
+        """Цвет клетки для силы хода от 0 до 1: от светло-желтого к красному."""
+        low, high = (255, 250, 210), (240, 60, 40)
+        red, green, blue = (round(a + (b - a) * strength) for a, b in zip(low, high))
+        return f"#{red:02x}{green:02x}{blue:02x}"
+
+    def draw_player(self, row, col):
+        """Отрисовка фигуры игрока."""
+        x = col * self.cell_size
+        y = row * self.cell_size
+        padding = self.cell_size * 0.2
+        color = "blue"
+        thickness = 2
+        self.canvas.create_line(
+            x + padding, y + padding,
+            x + self.cell_size - padding, y + self.cell_size - padding,
+            width=thickness,
+            fill=color
+        )
+        self.canvas.create_line(
+            x + self.cell_size - padding, y + padding,
+            x + padding, y + self.cell_size - padding,
+            width=thickness,
+            fill=color
+        )
+
+    def draw_opponent(self, row, col):
+        """Отрисовка фигуры противника."""
+        x = col * self.cell_size
+        y = row * self.cell_size
+        padding = self.cell_size * 0.2
+        color = "red"
+        thickness = 2
+        self.canvas.create_oval(
+            x + padding, y + padding,
+            x + self.cell_size - padding, y + self.cell_size - padding,
+            width=thickness,
+            outline=color
+        )
+
+    def on_click(self, event):
+        """Обработчик нажатия на игровое поле."""
+        row, col = event.y // self.cell_size, event.x // self.cell_size
+        if self.game.make_move(row, col):
+            self.draw_board()
+            self.refresh_labels()
+            if self.game.game_over:
+                self.stop_clock()
+                self.record_result()
+            if self.game.check_winner(1):
+                # x, y = self.canvas.winfo_width() / 2, self.canvas.winfo_height() / 2
+                # self.canvas.create_text(x, y, text="Крестики победили!", font="Arial 32")
+                messagebox.showinfo("Победа!", "Крестики победили!")
+            elif self.game.check_winner(-1):
+                # x, y = self.canvas.winfo_width() / 2, self.canvas.winfo_height() / 2
+                # self.canvas.create_text(x, y, text="Нолики победили!", font="Arial 32")
+                messagebox.showinfo("Поражение!", "Нолики победили!")
+            elif self.game.is_draw():
+                messagebox.showinfo("Ничья!", "Ничья!")
+
+    def change_mode(self, event):
+        """Обработчик изменения режима игры."""
+        self.game_mode = ModeState(self.mode_var.get())
+        self.reset_game()
+
+    def change_size(self):
+        """Обработчик изменения размера игрового поля."""
+        self.game_size = self.size_var.get()
+        self.reset_game()
+
+    def reset_game(self):
+        """Сброс игры."""
+        self.game = TicTacToe(mode=self.game_mode)
+        self.draw_board()
+        self.start_clock()
+
+    def start_clock(self):
+        """Запуск отсчета времени игры. Ранее запланированный тик отменяется."""
+        self.stop_clock()
+        self.start_time = time.monotonic()
+        self.tick()
+
+    def stop_clock(self):
+        """Отмена запланированного тика."""
+        if self.timer_id is not None:
+            self.root.after_cancel(self.timer_id)
+            self.timer_id = None
+
+    def tick(self):
+        """Единственный периодический обработчик приложения: обновляет время, ходы и статус."""
+        self.timer_id = None
+        self.refresh_labels()
+        if not self.game.game_over:
+            # Следующий тик - к началу следующей секунды игры
+            elapsed_ms = int((time.monotonic() - self.start_time) * 1000)
+            self.timer_id = self.root.after(1000 - elapsed_ms % 1000, self.tick)
+
+    def refresh_labels(self):
+        """Обновление надписей с временем, числом ходов и состоянием игры."""
+        elapsed = int(time.monotonic() - self.start_time)
+        self.set_label(self.time_var, f"Время: {elapsed // 60:02d}:{elapsed % 60:02d}")
+        self.set_label(self.moves_var, f"Ходов: {self.game.moves}")
+        self.update_status()
+
+    def set_label(self, var, text):
+        """Изменение текста надписи, только если он отличается от текущего."""
+        if self.label_texts.get(str(var)) != text:
+            self.label_texts[str(var)] = text
+            var.set(text)
+
+    def update_status(self):
+        """Обновление состояния игры."""
+        if self.game.winner:
+            winner = "X" if self.game.winner == 1 else "O"
+            self.set_label(self.status_var, f"{winner} победили!")
+        elif self.game.game_over:
+            self.set_label(self.status_var, "Ничья")
+        else:
+            current = "X" if self.game.current_player == 1 else "O"
+            self.set_label(self.status_var, f"{current} - ход")
+
+    def record_result(self):
+        """Сохранение результата завершенной партии против компьютера для вошедшего игрока (играет X)."""
+        if self.username is None or self.game.mode == ModeState.player:
+            return
+        if self.game.winner == 1:
+            result = GameResult.win
+        elif self.game.winner == -1:
+            result = GameResult.loss
+        else:
+            result = GameResult.draw
+        duration = int(time.monotonic() - self.start_time)
+        self.stats_service.record_game(self.username, result, self.game.moves, duration)
+        self.update_player_stats()
+
+    def update_player_stats(self):
+        """Обновление сводной статистики вошедшего игрока."""
+        stats = self.stats_service.get_stats(self.username) if self.username else None
+        if stats is None:
+            self.player_stats_var.set("")
+            return
+        best_time = stats["best_time"]
+        best_time = "-" if best_time is None else f"{best_time // 60:02d}:{best_time % 60:02d}"
+        self.player_stats_var.set(
+            f"Место: {self.stats_service.rank(self.username)}\n"
+            f"Побед: {stats['wins']}, поражений: {stats['losses']}, ничьих: {stats['draws']}\n"
+            f"Средняя партия: {stats['average_moves']:.1f} ходов\n"
+            f"Лучшее время: {best_time}"
+        )
+
+    def show_leaderboard(self):
+        """Окно с первыми игроками таблицы лидеров."""
+        window = tk.Toplevel(self.root)
+        window.title("Таблица лидеров")
+        window.resizable(False, False)
+        window.transient(self.root)
+
+        columns = ("place", "username", "wins", "losses", "draws")
+        table = ttk.Treeview(window, columns=columns, show="headings", height=10)
+        for column, heading in zip(columns, ("Место", "Игрок", "Победы", "Поражения", "Ничьи")):
+            table.heading(column, text=heading)
+            table.column(column, width=90, anchor=tk.CENTER)
+        for place, (username, stats) in enumerate(self.stats_service.top(10), start=1):
+            table.insert("", tk.END, values=(place, username, stats["wins"], stats["losses"], stats["draws"]))
+        table.pack(padx=10, pady=10)
+
+    def logout(self):
+        self.username = None
+        self.player_name_var.set("Гость")
+        self.update_player_stats()
+        LoginWindow(self.root, self.on_login)
+
+    def on_login(self, username):
+        self.username = username
+        self.player_name_var.set(username)
+        self.update_player_stats()
+
+    def run(self):
+        self.root.mainloop()
@@ -0,0 +1,59 @@
+"""Консольный вычислитель ходов компьютера без графического интерфейса.
+
+Читает из stdin по одной позиции на строку в формате JSON:
+    {"size": 10, "moves": [[5, 5], [4, 4]]}
+и выводит в stdout лучший ход для игрока, чья очередь ходить: [row, col].
+Для некорректной строки выводится {"error": "<описание>"}, и обработка продолжается.
+"""
+import json
+import sys
+
+from engine import ModeState, TicTacToe
+
+# Наибольший размер поля: таблицы окон и поиск растут с квадратом размера
+MAX_SIZE = 50
+
+
+def best_move(position):
+    """Лучший ход для позиции, заданной размером поля и списком сделанных ходов.
+
+    Вызывает ValueError, если позиция задана некорректно.
+    """
+    if not isinstance(position, dict):
+        raise ValueError("position must be a JSON object")
+    size = position.get("size", 10)
+    if type(size) is not int or not TicTacToe.winning_length <= size <= MAX_SIZE:
+        raise ValueError(f"invalid board size: {size!r}")
+    moves = position.get("moves", [])
+    if not isinstance(moves, list):
+        raise ValueError(f"moves must be a list: {moves!r}")
+    game = TicTacToe(size, mode=ModeState.player)
+    for move in moves:
+        if (not isinstance(move, list) or len(move) != 2
+                or not all(type(value) is int for value in move)):
+            raise ValueError(f"invalid move: {move!r}")
+        row, col = move
+        if not (0 <= row < size and 0 <= col < size):
+            raise ValueError(f"move outside the board: {move}")
+        if game.board[row][col]:
+            raise ValueError(f"cell is already occupied: {move}")
+        if game.game_over:
+            raise ValueError(f"move after the end of the game: {move}")
+        game.push((row, col))
+    if game.game_over:
+        raise ValueError("game is already over")
+    return list(game.get_best_move())
+
+
+def main():
+    for line in sys.stdin:
+        if line.strip():
+            try:
+                result = best_move(json.loads(line))
+            except ValueError as error:
+                result = {"error": str(error)}
+            print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()